@@ -1,102 +1,264 @@
+import argparse
+import ctypes
+import ctypes.wintypes
 import random
 import os
+import sys
+
+_BELIEF_LEVELS = ('Strong', 'Moderate', 'Weak')
+_ATTITUDES = ('Favorable', 'Neutral', 'Hostile')
+_RELIGIONS = ('None', 'Evangelist', 'Jehovah\'s Witness', 'Mormon', 'Custom', 'Satanic')
+_WEATHER = ('hot', 'cold', 'nice')
+
+# Cumulative belief level weights by location type, with None as the default
+_CUM_WEIGHTS = {
+    'Church': (0.6, 0.9, 1.0),
+    'School': (0.1, 0.3, 1.0),
+    None: (0.3, 0.7, 1.0),
+}
+
+# Conversion chance multipliers indexed by belief level and attitude code
+_LEVEL_MUL = (0.5, 1.0, 2.0)
+_ATT_MUL = (2.0, 1.0, 0.5)
+
+# ANSI escape sequence that clears the screen and moves the cursor home
+_CLEAR_SEQ = '\x1b[2J\x1b[H'
+
+def _enable_vt_mode():
+    """
+    This function enables ANSI escape sequence processing on the Windows console, 
+    so that the console can be cleared by writing _CLEAR_SEQ. Other platforms 
+    support escape sequences already.
+    """
+    if os.name != 'nt':
+        return
+    wintypes = ctypes.wintypes
+    # A private handle to kernel32, so the prototypes below don't affect ctypes.windll
+    kernel32 = ctypes.WinDLL('kernel32')
+    kernel32.GetStdHandle.argtypes = (wintypes.DWORD,)
+    kernel32.GetStdHandle.restype = wintypes.HANDLE
+    kernel32.GetConsoleMode.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.GetConsoleMode.restype = wintypes.BOOL
+    kernel32.SetConsoleMode.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+    kernel32.SetConsoleMode.restype = wintypes.BOOL
+    handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+    mode = wintypes.DWORD()
+    if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+        kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+
+def _resolve_conversion(conversion_rate, level_code, attitude_code, u):
+    """
+    This function decides whether an NPC converts. The conversion chance is the 
+    conversion rate adjusted for the NPC's belief level and attitude codes, and 
+    the NPC converts if the uniform random number u is below it. It works on 
+    plain numbers only, so it can be shared by single encounters and batches.
+    """
+    return u < conversion_rate * _LEVEL_MUL[level_code] * _ATT_MUL[attitude_code]
 
 class Beliefs:
     """
     This class represents the beliefs of an NPC. Each NPC has a belief level,
-    an attitude, and a religion. The belief level probabilities are influenced 
-    by the type of location where the NPC is found.
+    an attitude, and a religion. The beliefs are stored as codes in the arrays 
+    of the NPC's location, and this class is a view onto them. The belief level 
+    probabilities are influenced by the type of location where the NPC is found.
     """
-    def __init__(self, location_type):
-        belief_levels = ['Strong', 'Moderate', 'Weak']
-        attitudes = ['Favorable', 'Neutral', 'Hostile']
-        religions = ['None', 'Evangelist', 'Jehovah\'s Witness', 'Mormon', 'Custom', 'Satanic']
-
-        # Adjust probabilities based on location type
-        if location_type in ['Church']:
-            belief_levels_weights = [0.6, 0.3, 0.1]
-        elif location_type in ['School']:
-            belief_levels_weights = [0.1, 0.2, 0.7]
-        else:
-            belief_levels_weights = [0.3, 0.4, 0.3]
+    __slots__ = ('location', 'npc_id')
+
+    def __init__(self, location, npc_id):
+        self.location = location
+        self.npc_id = npc_id
+
+    @property
+    def level(self):
+        return _BELIEF_LEVELS[self.location.belief_level[self.npc_id]]
 
-        self.level = random.choices(belief_levels, weights=belief_levels_weights, k=1)[0]
-        self.attitude = random.choice(attitudes)
-        self.religion = random.choice(religions)
+    @property
+    def attitude(self):
+        return _ATTITUDES[self.location.attitude[self.npc_id]]
+
+    @property
+    def religion(self):
+        return _RELIGIONS[self.location.religion[self.npc_id]]
+
+    @religion.setter
+    def religion(self, religion):
+        self.location.religion[self.npc_id] = _RELIGIONS.index(religion)
 
 
 class NPC:
     """
     This class represents an NPC who may be converted by the player. 
     An NPC has a resistance to conversion, a record of failed conversion 
-    attempts, and a set of beliefs.
+    attempts, and a set of beliefs. The NPC's state is stored in the arrays 
+    of its location, and this class is a view onto them.
     """
-    def __init__(self, location_type):
-        self.converted = False
-        self.failed_attempts = 0
-        self.resistant = random.choice([True, False])
-        self.beliefs = Beliefs(location_type)
+    __slots__ = ('location', 'npc_id', 'beliefs')
+
+    def __init__(self, location, npc_id):
+        self.location = location
+        self.npc_id = npc_id
+        self.beliefs = Beliefs(location, npc_id)
+
+    @property
+    def converted(self):
+        return self.location.converted[self.npc_id]
+
+    @property
+    def failed_attempts(self):
+        return self.location.failed_attempts[self.npc_id]
+
+    @property
+    def resistant(self):
+        return self.location.resistant[self.npc_id]
 
-    def convert(self, player_religion, conversion_rate):
+    def convert(self, player_religion, conversion_rate, rng):
         """
         This method attempts to convert the NPC to the player's religion. The 
         success of the conversion is influenced by the NPC's current religion, 
-        belief level, attitude, and a random factor. If the conversion is 
-        successful, the NPC's religion is changed to the player's religion.
+        belief level, attitude, and a random factor drawn from the game's random 
+        number generator. If the conversion is successful, the NPC's religion is 
+        changed to the player's religion. It returns True only when the conversion 
+        has just made the location a church.
         """
         if self.beliefs.religion == player_religion:
             print("This person is already a follower of your religion.")
-            return
-        conversion_chance = conversion_rate
-        if self.beliefs.level == 'Strong':
-            conversion_chance *= 0.5
-        elif self.beliefs.level == 'Weak':
-            conversion_chance *= 2
-        if self.beliefs.attitude == 'Favorable':
-            conversion_chance *= 2
-        elif self.beliefs.attitude == 'Hostile':
-            conversion_chance *= 0.5
-        self.converted = random.random() < conversion_chance
-        if self.converted:
-            self.beliefs.religion = player_religion
+            return False
+        location, npc_id = self.location, self.npc_id
+        if _resolve_conversion(
+            conversion_rate, location.belief_level[npc_id], location.attitude[npc_id], rng.random()
+        ):
+            return location.mark_converted(npc_id, player_religion)
+        return False
 
 
 class Location:
     """
     This class represents a location that the player can visit. A location 
     has a type (House, Apartment, Park, School, Office, Café, Restaurant, 
-    Shopping Center, Church, or Hospital) and a number of NPCs. If at least 
+    Shopping Center, Church, or Hospital) and a number of NPCs. The NPCs are 
+    stored as parallel arrays, one per attribute, indexed by NPC id. If at least 
     ten NPCs at a location have been converted, the location becomes a church 
     of the player's religion.
     """
     location_types = ['House', 'Apartment', 'Park', 'School', 'Office', 
                       'Café', 'Restaurant', 'Shopping Center', 'Church', 'Hospital']
-
-    def __init__(self, num_npcs):
-        self.type = random.choice(Location.location_types)
-        self.npcs = [NPC(self.type) for _ in range(num_npcs)]
+    __slots__ = ('type', 'num_npcs', 'church', 'church_religion', '_roster_cache',
+                 'converted', 'converted_count', 'failed_attempts', 'resistant',
+                 'belief_level', 'attitude', 'religion')
+
+    def __init__(self, num_npcs, rng):
+        self.type = rng.choice(Location.location_types)
+        self.num_npcs = num_npcs
+        self._build_npcs(num_npcs, rng)
         self.church = False
         self.church_religion = None
+        self._roster_cache = None
+
+    def _build_npcs(self, num_npcs, rng):
+        """
+        This method generates the NPCs at the location. Belief levels, attitudes and 
+        religions are each drawn for all NPCs with a single sampling call, with belief 
+        levels using the precomputed cumulative weights for the location type. Each 
+        NPC's resistance is a separate coin flip. Beliefs are stored as indexes into 
+        the module-level belief tables.
+        """
+        self.converted = [False] * num_npcs
+        self.converted_count = 0
+        self.failed_attempts = [0] * num_npcs
+        _rand = rng.random
+        self.resistant = [_rand() < 0.5 for _ in range(num_npcs)]
+        cum_weights = _CUM_WEIGHTS.get(self.type, _CUM_WEIGHTS[None])
+        self.belief_level = rng.choices(range(len(_BELIEF_LEVELS)), cum_weights=cum_weights, k=num_npcs)
+        self.attitude = rng.choices(range(len(_ATTITUDES)), k=num_npcs)
+        self.religion = rng.choices(range(len(_RELIGIONS)), k=num_npcs)
+
+    def npc(self, npc_id):
+        """
+        This method returns a view of the NPC with the given id.
+        """
+        return NPC(self, npc_id)
+
+    def simulate_batch(self, player_religion, conversion_rate, rng):
+        """
+        This method simulates a whole round of preaching at the location without any 
+        player input, for use by headless or autoplay modes. Every NPC who is not 
+        converted, not resistant, and not already a follower of the player's religion 
+        is approached once at the given conversion rate, with the same two draws as 
+        an encounter: the NPC must first be interested, and then convert. It returns 
+        the number of NPCs converted in the round, and whether the location has just 
+        become a church.
+        The caller computes the conversion rate, including the location's multiplier 
+        and any Satanic boost, and is responsible for adding the conversions to the 
+        game's score and the new church to the game's church count. Failed attempts 
+        are not recorded, so they do not lower the rate in later rounds.
+        """
+        # As in encounter, a rate of 0 or at least 1 decides interest without a draw
+        if conversion_rate <= 0.0:
+            return 0, False
+        always_interested = conversion_rate >= 1.0
+        religion_code = _RELIGIONS.index(player_religion)
+        converted, resistant, religion = self.converted, self.resistant, self.religion
+        belief_level, attitude = self.belief_level, self.attitude
+        _rand = rng.random
+        newly_converted = [
+            i for i in range(self.num_npcs)
+            if not converted[i] and not resistant[i] and religion[i] != religion_code
+            and (always_interested or _rand() < conversion_rate)
+            and _resolve_conversion(conversion_rate, belief_level[i], attitude[i], _rand())
+        ]
+        new_church = False
+        for i in newly_converted:
+            new_church = self.mark_converted(i, player_religion) or new_church
+        return len(newly_converted), new_church
+
+    def mark_converted(self, npc_id, player_religion):
+        """
+        This method records that the NPC with the given id has converted to the 
+        player's religion. It updates the running count of converted NPCs, clears 
+        the cached roster, and checks whether the location has become a church. 
+        Every conversion goes through this method. It returns True only when the 
+        location has just become a church.
+        """
+        self.converted[npc_id] = True
+        self.religion[npc_id] = _RELIGIONS.index(player_religion)
+        self.converted_count += 1
+        self._roster_cache = None
+        return self.check_church_status(player_religion)
+
+    def roster(self):
+        """
+        This method returns the list of NPCs at the location, showing whether each 
+        one has been converted, as a single string. The string is cached and only 
+        rebuilt after an NPC at the location is converted.
+        """
+        if self._roster_cache is None:
+            self._roster_cache = ''.join([
+                f"{i + 1}. Person {i + 1}: {'Converted' if converted else 'Not Converted'}\n"
+                for i, converted in enumerate(self.converted)
+            ])
+        return self._roster_cache
 
     def check_church_status(self, player_religion):
         """
         This method checks if the location has become a church of the player's religion.
         If at least ten NPCs at the location have been converted, the location becomes 
-        a church of the player's religion.
+        a church of the player's religion. It returns True only when the location has 
+        just become a church.
         """
-        if sum(npc.converted for npc in self.npcs) >= 10:
+        if not self.church and self.converted_count >= 10:
             self.church = True
             self.church_religion = player_religion
+            return True
+        return False
 
     def get_conversion_rate_multiplier(self):
         """
         This method calculates a conversion rate multiplier based on the proportion of 
         NPCs at the location that have been converted. The conversion rate multiplier 
-        is 1 plus the proportion of converted NPCs.
+        is 1 plus the proportion of converted NPCs, taken from the running count of 
+        converted NPCs kept on the location.
         """
-        num_converted = sum(npc.converted for npc in self.npcs)
-        num_total = len(self.npcs)
-        return 1 + (num_converted / num_total)
+        return 1 + (self.converted_count / self.num_npcs)
 
 
 class Neighborhood:
@@ -104,8 +266,11 @@ class Neighborhood:
     This class represents a neighborhood that the player can visit. A neighborhood 
     has a number of locations.
     """
-    def __init__(self, num_locations):
-        self.locations = [Location(random.randint(0, 10)) for _ in range(num_locations)]
+    __slots__ = ('locations',)
+
+    def __init__(self, num_locations, rng):
+        npc_counts = rng.choices(range(11), k=num_locations)
+        self.locations = [Location(num_npcs, rng) for num_npcs in npc_counts]
 
 
 class Game:
@@ -113,42 +278,118 @@ class Game:
     This class represents the game itself. The game has a score, representing the total 
     number of NPCs converted, and a hunger level, which increases as the player takes actions. 
     When the hunger level reaches 100, the day ends and the player must rest. The game also 
-    keeps track of the player's chosen religion, the conversion rate for each religion, and 
-    the neighborhoods that the player can visit.
+    keeps track of the player's chosen religion, the base conversion rate for each religion, 
+    and the neighborhoods that the player can visit. All random draws come from the game's 
+    own random number generator, which is seeded so that a game can be recorded to a 
+    log of the seed and the player's inputs, and replayed from that log exactly.
     """
-    def __init__(self):
+    __slots__ = ('seed', 'rng', '_replay_inputs', '_record_path', '_record_file', 'score', 'satanic_score',
+                 'hunger', 'revisit_list', 'religions', 'base_conversion_rates', 'satanic_boost',
+                 'neighborhoods', 'chosen_location', 'days', 'day_of_week', 'daily_score',
+                 'num_churches', 'religion', 'weather', 'strategy')
+
+    def __init__(self, seed=None, record_path=None, replay_inputs=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._replay_inputs = iter(replay_inputs) if replay_inputs is not None else None
+        self._record_path = record_path
+        self._record_file = None
         self.score = 0
         self.satanic_score = 0
         self.hunger = 0
         self.revisit_list = []
         self.religions = ['Evangelist', 'Jehovah\'s Witness', 'Mormon', 'Custom']
-        self.conversion_rates = {'Evangelist': 0.3, 'Jehovah\'s Witness': 0.2, 'Mormon': 0.25, 'Custom': 0.15, 'Satanic': 0.5}
-        self.neighborhoods = [Neighborhood(random.randint(1, 10)) for _ in range(2)]
+        self.base_conversion_rates = {'Evangelist': 0.3, 'Jehovah\'s Witness': 0.2, 'Mormon': 0.25, 'Custom': 0.15, 'Satanic': 0.5}
+        self.satanic_boost = 1.0
+        self.neighborhoods = [Neighborhood(num_locations, self.rng) for num_locations in self.rng.choices(range(1, 11), k=2)]
         self.chosen_location = None
         self.days = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
         self.day_of_week = 0
         self.daily_score = 0
+        self.num_churches = 0
+
+    @classmethod
+    def replay(cls, path):
+        """
+        This method creates a game from a log written with record_path. The game is 
+        seeded with the recorded seed, and the recorded inputs are played back in place 
+        of the player's. Once the log runs out, the player takes over. A ValueError 
+        is raised if the log does not start with a recorded seed.
+        """
+        with open(path, encoding='utf-8') as log:
+            lines = log.read().splitlines()
+        if not lines:
+            raise ValueError(f"'{path}' is empty, expected a recorded seed on the first line")
+        try:
+            seed = int(lines[0])
+        except ValueError:
+            raise ValueError(f"'{path}' does not start with a recorded seed") from None
+        return cls(seed=seed, replay_inputs=lines[1:])
 
     def start_game(self):
         """
         This method starts the game. It welcomes the player, lets them choose a religion, 
         and then loops through each day of a week. Each day, the player goes door-to-door 
         trying to convert NPCs until their hunger level reaches 100. At the end of the week, 
-        the game ends.
+        the game ends. When recording, the log is opened here and closed when the game 
+        ends, however it ends.
         """
+        if self._record_path is not None:
+            self._record_file = open(self._record_path, 'w', encoding='utf-8')
+            self._record_file.write(f"{self.seed}\n")
         print("Welcome to Belen Torres Preaching The Truth\n")
         print("In this game, you play as a preacher for a chosen religion. Your goal is to win as many souls as you can by going door-to-door and preaching your faith. Your performance is scored based on the number of souls won.\n")
         print("Each day you will encounter various responses from people behind the doors, and your hunger will increase as you continue preaching. When your hunger reaches 100, the day ends and you must go home to rest.\n")
         print("Now, let's begin. Choose your religion...\n")
-        self.choose_religion()
-        for _ in range(7):
-            self.new_day()
-            while self.hunger < 100:
-                self.door_to_door()
-            self.hunger = 0
-            self.day_of_week = (self.day_of_week + 1) % 7
-            self.daily_score = 0
-        self.end_game()
+        try:
+            self.choose_religion()
+            for _ in range(7):
+                self.new_day()
+                while self.hunger < 100:
+                    self.door_to_door()
+                self.hunger = 0
+                self.day_of_week = (self.day_of_week + 1) % 7
+                self.daily_score = 0
+            self.end_game()
+        finally:
+            if self._record_file is not None:
+                self._record_file.close()
+                self._record_file = None
+
+    def _input(self, prompt):
+        """
+        This method reads a line of input from the player. When replaying a log, the 
+        recorded input is shown after the prompt instead. When recording, each line 
+        the player enters is written to the log.
+        """
+        if self._replay_inputs is not None:
+            line = next(self._replay_inputs, None)
+            if line is not None:
+                print(prompt + line)
+                return line
+            self._replay_inputs = None
+        line = input(prompt)
+        if self._record_file is not None:
+            self._record_file.write(line + "\n")
+            self._record_file.flush()
+        return line
+
+    def _prompt_int(self, prompt, lo, hi):
+        """
+        This method asks the player for a number between lo and hi, inclusive, and 
+        keeps asking until a valid number is entered. Input that is not a number is 
+        rejected with a string check rather than by catching a ValueError.
+        """
+        while True:
+            choice = self._input(prompt).strip()
+            if not choice.isdecimal():
+                print("Invalid input. Please enter a number.")
+            elif lo <= int(choice) <= hi:
+                return int(choice)
+            else:
+                print(f"Invalid choice. Please enter a number between {lo} and {hi}.")
 
     def choose_religion(self):
         """
@@ -157,15 +398,7 @@ class Game:
         print("Choose your religion:\n")
         for i, religion in enumerate(self.religions, start=1):
             print(f"{i}. {religion}")
-        while True:
-            try:
-                choice = int(input("Enter the number of your choice: "))
-                if 1 <= choice <= len(self.religions):
-                    break
-                else:
-                    print(f"Invalid choice. Please enter a number between 1 and {len(self.religions)}.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+        choice = self._prompt_int("Enter the number of your choice: ", 1, len(self.religions))
         self.religion = self.religions[choice - 1]
         print(f"You've chosen: {self.religion}\n")
 
@@ -174,7 +407,7 @@ class Game:
         This method starts a new day in the game. It randomly sets the weather, 
         and then lets the player choose a neighborhood and location to visit.
         """
-        self.weather = random.choice(['hot', 'cold', 'nice'])
+        self.weather = _WEATHER[int(self.rng.random() * 3)]
         print(f"A new day begins... The weather is {self.weather}.")
         self.choose_neighborhood_and_location()
 
@@ -186,30 +419,14 @@ class Game:
         print("Choose your neighborhood:\n")
         for i, neighborhood in enumerate(self.neighborhoods, start=1):
             print(f"{i}. Neighborhood {i} with {len(neighborhood.locations)} locations")
-        while True:
-            try:
-                choice = int(input("Enter the number of your choice: "))
-                if 1 <= choice <= len(self.neighborhoods):
-                    break
-                else:
-                    print(f"Invalid choice. Please enter a number between 1 and {len(self.neighborhoods)}.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+        choice = self._prompt_int("Enter the number of your choice: ", 1, len(self.neighborhoods))
         chosen_neighborhood = self.neighborhoods[choice - 1]
         print(f"You've chosen: Neighborhood {choice}\n")
 
         print("Choose your location:\n")
         for i, location in enumerate(chosen_neighborhood.locations, start=1):
-            print(f"{i}. Location {i} with {len(location.npcs)} NPCs")
-        while True:
-            try:
-                choice = int(input("Enter the number of your choice: "))
-                if 1 <= choice <= len(chosen_neighborhood.locations):
-                    break
-                else:
-                    print(f"Invalid choice. Please enter a number between 1 and {len(chosen_neighborhood.locations)}.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+            print(f"{i}. Location {i} with {location.num_npcs} NPCs")
+        choice = self._prompt_int("Enter the number of your choice: ", 1, len(chosen_neighborhood.locations))
         self.chosen_location = chosen_neighborhood.locations[choice - 1]
         print(f"You've chosen: Location {choice}\n")
 
@@ -220,35 +437,32 @@ class Game:
         player chooses an NPC to approach, chooses a preaching strategy, and then 
         has an encounter with the NPC.
         """
+        # Bind what the loop uses to locals; the location only changes on moving on
+        clear_console = self.clear_console
+        prompt_int = self._prompt_int
+        location = self.chosen_location
+        num_npcs = location.num_npcs
         while self.hunger < 100:
-            self.clear_console()
-            print(f"You are at a {self.chosen_location.type} with {len(self.chosen_location.npcs)} people.\n")
-            for i in range(len(self.chosen_location.npcs)):
-                npc_status = "Converted" if self.chosen_location.npcs[i].converted else "Not Converted"
-                print(f"{i + 1}. Person {i + 1}: {npc_status}")
+            clear_console()
+            print(f"You are at a {location.type} with {num_npcs} people.\n")
+            sys.stdout.write(location.roster())
             print("Choose a person to approach or enter 0 to move on.")
-            while True:
-                try:
-                    choice = int(input("Enter the number of your choice: "))
-                    if 0 <= choice <= len(self.chosen_location.npcs):
-                        break
-                    else:
-                        print(f"Invalid choice. Please enter a number between 0 and {len(self.chosen_location.npcs)}.")
-                except ValueError:
-                    print("Invalid input. Please enter a number.")
+            choice = prompt_int("Enter the number of your choice: ", 0, num_npcs)
             if choice == 0:
                 print("Moving on to the next location...\n")
                 self.choose_neighborhood_and_location()
+                location = self.chosen_location
+                num_npcs = location.num_npcs
                 continue
             chosen_npc_id = choice - 1
-            if self.chosen_location.npcs[chosen_npc_id].converted:
+            if location.converted[chosen_npc_id]:
                 print("This person has already been converted.\n")
                 continue
             print("Approaching the chosen person...\n")
             self.choose_strategy()
             self.encounter(chosen_npc_id)
             self.hunger_increase()
-            next_action = input("Press Enter to continue, or 'd' to view the dashboard.")
+            next_action = self._input("Press Enter to continue, or 'd' to view the dashboard.")
             if next_action.lower() == 'd':
                 self.display_dashboard()
 
@@ -275,57 +489,54 @@ class Game:
         strategies = ['Preach Softly', 'Preach Intensely']
         for i, strategy in enumerate(strategies, start=1):
             print(f"{i}. {strategy}")
-        while True:
-            try:
-                choice = int(input("Enter the number of your choice: "))
-                if 1 <= choice <= len(strategies):
-                    break
-                else:
-                    print(f"Invalid choice. Please enter a number between 1 and {len(strategies)}.")
-            except ValueError:
-                print("Invalid input. Please enter a number.")
+        choice = self._prompt_int("Enter the number of your choice: ", 1, len(strategies))
         self.strategy = strategies[choice - 1]
         print(f"You've chosen to: {self.strategy}\n")
 
     def encounter(self, npc_id):
         """
         This method represents an encounter between the player and an NPC. If the NPC 
-        is resistant, the encounter ends. Otherwise, the conversion rate is adjusted 
-        based on the proportion of NPCs at the location that have been converted, and 
-        then the NPC has a chance to respond positively or negatively to the player's 
-        preaching. If the NPC responds positively, there is a chance that they will be 
-        converted. If the NPC is converted, the player's score increases, and there is 
-        a chance that the NPC will donate food to the player.
-        """
-        chosen_npc = self.chosen_location.npcs[npc_id]
-        if chosen_npc.resistant:
+        is resistant, the encounter ends. Otherwise, the base conversion rate of the 
+        player's religion is scaled by the proportion of NPCs at the location that have 
+        been converted, without changing the base rate itself, and then the NPC has a 
+        chance to respond positively or negatively to the player's preaching. If the NPC 
+        responds positively, there is a chance that they will be converted. If the NPC 
+        is converted, the player's score increases, and there is a chance that the NPC 
+        will donate food to the player.
+        """
+        location = self.chosen_location
+        _rand = self.rng.random
+        if location.resistant[npc_id]:
             print("This person is resistant to conversion.")
             return
-        conversion_rate_multiplier = self.chosen_location.get_conversion_rate_multiplier()
-        for religion in self.conversion_rates:
-            self.conversion_rates[religion] *= conversion_rate_multiplier
-        conversion_rate = max(0, self.conversion_rates[self.religion] - chosen_npc.failed_attempts * 0.1)
-        responses = ['bad', 'nice']
-        response = random.choices(
-            responses,
-            weights=[1 - conversion_rate, conversion_rate],
-            k=1
-        )[0]
-        if response == 'bad':
+        conversion_rate_multiplier = location.get_conversion_rate_multiplier()
+        if self.religion == 'Satanic':
+            conversion_rate_multiplier *= self.satanic_boost
+        conversion_rate = max(0.0, self.base_conversion_rates[self.religion] * conversion_rate_multiplier - location.failed_attempts[npc_id] * 0.1)
+        # A rate of 0 or at least 1 decides the response without a random draw
+        if conversion_rate <= 0.0:
+            nice = False
+        elif conversion_rate >= 1.0:
+            nice = True
+        else:
+            nice = _rand() < conversion_rate
+        if not nice:
             print("The person is not interested.")
             self.bad_response()
-            chosen_npc.failed_attempts += 1
-        elif response == 'nice':
+            location.failed_attempts[npc_id] += 1
+        else:
             print("The person is interested.")
-            chosen_npc.convert(self.religion, conversion_rate)
-            if chosen_npc.converted:
+            new_church = location.npc(npc_id).convert(self.religion, conversion_rate, self.rng)
+            if location.converted[npc_id]:
                 print("The person converts!")
                 if self.religion == 'Satanic':
                     self.satanic_score += 1
                 else:
                     self.score += 1
                     self.daily_score += 1
-                if random.random() < 0.2:
+                if new_church:
+                    self.num_churches += 1
+                if _rand() < 0.2:
                     self.food_donation()
 
     def food_donation(self):
@@ -335,7 +546,7 @@ class Game:
         hunger level by 20.
         """
         print("The person donates some food to you!\n")
-        eat_food = input("Do you want to eat the donated food now? (y/n) ")
+        eat_food = self._input("Do you want to eat the donated food now? (y/n) ")
         if eat_food.lower() == 'y':
             print("You eat the food and feel less hungry.\n")
             self.hunger = max(0, self.hunger - 20)
@@ -348,8 +559,8 @@ class Game:
         also a chance that the player will meet another Satanic preacher, who will 
         join their cause and double the conversion rate for Satanism.
         """
-        if random.random() < 0.1:
-            if random.random() < 0.5:
+        if self.rng.random() < 0.1:
+            if self.rng.random() < 0.5:
                 self.food_donation()
             elif self.religion != 'Satanic':
                 self.receive_satanic_bible()
@@ -362,7 +573,7 @@ class Game:
         The player can choose to take the Bible and become a Satanic preacher.
         """
         print("The person throws a Satanic Bible at you!")
-        take_bible = input("Do you want to take the Satanic Bible and become a Satanic preacher? (y/n) ")
+        take_bible = self._input("Do you want to take the Satanic Bible and become a Satanic preacher? (y/n) ")
         if take_bible.lower() == 'y':
             print("You take the Satanic Bible and become a Satanic preacher!")
             self.religion = 'Satanic'
@@ -370,11 +581,11 @@ class Game:
     def meet_satanic_preacher(self):
         """
         This method represents the player meeting another Satanic preacher. The 
-        other preacher joins the player's cause, and the conversion rate for 
-        Satanism is doubled.
+        other preacher joins the player's cause, and the boost applied to the 
+        conversion rate for Satanism is doubled.
         """
         print("You meet another Satanic preacher who joins your cause!")
-        self.conversion_rates['Satanic'] *= 2
+        self.satanic_boost *= 2
 
     def end_game(self):
         """
@@ -384,8 +595,7 @@ class Game:
         at least 10 souls to Satanism, they have the option to become a vampire or 
         a werewolf.
         """
-        num_churches = sum(location.church for neighborhood in self.neighborhoods for location in neighborhood.locations)
-        if num_churches >= 3:
+        if self.num_churches >= 3:
             print("You've created three churches and won the game!")
         else:
             print(f"You've won {self.score} souls!")
@@ -398,7 +608,7 @@ class Game:
         player can choose to become a vampire or a werewolf.
         """
         while True:
-            choice = input("You've won 10 souls to Satanism! Would you like to become a vampire or a werewolf? (v/w) ")
+            choice = self._input("You've won 10 souls to Satanism! Would you like to become a vampire or a werewolf? (v/w) ")
             if choice.lower() in ['v', 'w']:
                 break
             else:
@@ -410,13 +620,11 @@ class Game:
 
     def clear_console(self):
         """
-        This method clears the console. It checks the operating system and uses 
-        the appropriate command to clear the console.
+        This method clears the console by writing an ANSI escape sequence, rather 
+        than starting a shell to run the operating system's clear command. The 
+        sequence is flushed along with the rest of the screen at the next prompt.
         """
-        if os.name == 'nt':
-            os.system('cls')
-        else:
-            os.system('clear')
+        sys.stdout.write(_CLEAR_SEQ)
 
     def display_dashboard(self):
         """
@@ -432,7 +640,34 @@ class Game:
             print(f"People converted to Satanism: {self.satanic_score}")
         print(f"Hunger level: {self.hunger}")
         print(f"Weather: {self.weather}")
-        input("\nPress Enter to continue...")
-
-game = Game()
-game.start_game()
+        self._input("\nPress Enter to continue...")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Belen Torres Preaching The Truth")
+    parser.add_argument('--seed', type=int, help="seed for the game's random number generator")
+    parser.add_argument('--record', metavar='PATH', help="record the seed and your inputs to a log")
+    parser.add_argument('--replay', metavar='PATH', help="replay a game from a recorded log")
+    args = parser.parse_args()
+    if args.replay and (args.seed is not None or args.record):
+        parser.error("argument --replay: not allowed with argument --seed or --record")
+    if args.replay:
+        try:
+            game = Game.replay(args.replay)
+        except OSError as error:
+            parser.error(f"argument --replay: can't open '{args.replay}': {error.strerror}")
+        except ValueError as error:
+            parser.error(f"argument --replay: {error}")
+    else:
+        if args.record:
+            # Fail now rather than after the game has started if the log can't be written
+            try:
+                open(args.record, 'w', encoding='utf-8').close()
+            except OSError as error:
+                parser.error(f"argument --record: can't open '{args.record}': {error.strerror}")
+        game = Game(args.seed, args.record)
+    # Buffer console output; input() flushes stdout before reading, so each
+    # screen is written out in one go when the game waits for the player
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    _enable_vt_mode()
+    game.start_game()